@@ -80,7 +80,7 @@ if __name__ == '__main__':
 
     logging.info('Found {} groundtruths and {} test files.'.format(len(gtfiles), len(tsfiles)))
     logging.info('Available LAP solvers {}'.format(mm.lap.available_solvers))
-    logging.info('Default LAP solver \'{}\''.format(mm.lap.default_solver))
+    logging.info('Default LAP solver \'{}\''.format(mm.lap.default_solver or 'auto'))
     logging.info('Loading files.')
     
     gt = OrderedDict([(Path(f).parts[-3], mm.io.loadtxt(f, fmt=args.fmt, min_confidence=1)) for f in gtfiles])
@@ -1,11 +1,14 @@
 import numpy as np
+import itertools
 from collections import OrderedDict
 
 def linear_sum_assignment(costs, solver=None):
     """Solve a linear sum assignment problem (LSA).
 
     For large datasets solving the minimum cost assignment becomes the dominant runtime part. 
-    We therefore support various solvers out of the box (currently lapsolver, scipy, ortools, munkres)
+    We therefore support various solvers out of the box (currently lapsolver, lap, scipy, ortools, munkres).
+    The LAPJV based solvers `lapsolver` and `lap` are considerably faster than the remaining ones and are
+    therefore preferred when available.
     
     Params
     ------
@@ -18,11 +21,20 @@ def linear_sum_assignment(costs, solver=None):
     solver : callable or str, optional
         When str: name of solver to use.
         When callable: function to invoke
-        When None: uses first available solver
+        When None: uses `default_solver` if set. Otherwise tiny problems are solved by
+        enumeration and larger ones by the first available solver in the order lapsolver,
+        lap, scipy, ortools, munkres
     """
 
     solver = solver or default_solver
 
+    if solver is None:
+        # No solver chosen, pick automatically. Tiny problems are more quickly
+        # solved by enumeration than by dispatching to the standard solvers.
+        if max(costs.shape) <= _TINY_LSA_SIZE:
+            return lsa_solve_tiny(costs)
+        solver = available_solvers[0] if len(available_solvers) > 0 else None
+
     if isinstance(solver, str):
         # Try resolve from string
         solver = solver_map.get(solver, None)    
@@ -30,24 +42,61 @@ def linear_sum_assignment(costs, solver=None):
     assert callable(solver), 'Invalid LAP solver.'
     return solver(costs)
 
+def _prep(costs, valid=None):
+    """Replace unassignable entries of the cost matrix by a safe value.
+
+    Computes a value that indicates 'cannot assign' and makes a copy of the
+    cost matrix with all non-finite entries replaced by it. Note + 1 is
+    necessary in below inv-dist computation to make invdist bigger than max
+    dist in case max dist is zero. When all entries are finite the matrix is
+    returned without copying. A precomputed mask of finite entries may be
+    passed as `valid`.
+    """
+    if valid is None:
+        valid = np.isfinite(costs)
+    if not valid.all():
+        costs = costs.copy()
+        v = costs[valid]
+        INVDIST = 2 * v.max() + 1 if v.shape[0] > 0 else 1.
+        costs[~valid] = INVDIST
+    return costs
+
+def lsa_solve_tiny(costs):
+    """Solves tiny LSA problems by enumerating all possible assignments."""
+    R, C = costs.shape
+    if R == 0 or C == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+    transposed = R > C
+    if transposed:
+        costs = costs.T
+        R, C = C, R
+
+    costs = _prep(costs)
+
+    rids = np.arange(R, dtype=np.int64)
+    perms = _TINY_LSA_PERMS[(R, C)]
+    cids = perms[costs[rids, perms].sum(axis=1).argmin()]
+
+    if transposed:
+        order = np.argsort(cids)
+        return cids[order], rids[order]
+    return rids, cids
+
+_TINY_LSA_SIZE = 4
+_TINY_LSA_PERMS = dict(
+    ((r, c), np.array(list(itertools.permutations(range(c), r)), dtype=np.int64))
+    for r in range(1, _TINY_LSA_SIZE + 1) for c in range(r, _TINY_LSA_SIZE + 1)
+)
+
 def lsa_solve_scipy(costs):
     """Solves the LSA problem using the scipy library."""
 
     from scipy.optimize import linear_sum_assignment as scipy_solve
-   
-    # Note there is an issue in scipy.optimize.linear_sum_assignment where
-    # it runs forever if an entire row/column is infinite or nan. We therefore
-    # make a copy of the distance matrix and compute a safe value that indicates
-    # 'cannot assign'. Also note + 1 is necessary in below inv-dist computation
-    # to make invdist bigger than max dist in case max dist is zero.
-    
-    inv = ~np.isfinite(costs)
-    if inv.any():
-        costs = costs.copy()
-        valid = costs[~inv]
-        INVDIST = 2 * valid.max() + 1 if valid.shape[0] > 0 else 1.
-        costs[inv] = INVDIST
 
+    # Note there is an issue in scipy.optimize.linear_sum_assignment where
+    # it runs forever if an entire row/column is infinite or nan.
+    costs = _prep(costs)
     return scipy_solve(costs)
 
 def lsa_solve_lapsolver(costs):
@@ -57,16 +106,14 @@ def lsa_solve_lapsolver(costs):
 
 def lsa_solve_munkres(costs):
     """Solves the LSA problem using the Munkres library."""
-    from munkres import Munkres, DISALLOWED
+    from munkres import Munkres
     m = Munkres()
 
-    costs = costs.copy()
-    inv = ~np.isfinite(costs)
-    if inv.any():
-        costs = costs.astype(object)
-        costs[inv] = DISALLOWED       
+    # Unassignable entries are replaced by a safe float value instead of
+    # converting to an object matrix holding DISALLOWED markers.
+    costs = _prep(costs)
 
-    indices = np.array(m.compute(costs), dtype=np.int64)
+    indices = np.array(m.compute(costs.tolist()), dtype=np.int64)
     return indices[:,0], indices[:,1]
 
 
@@ -90,14 +137,34 @@ def lsa_solve_ortools(costs):
     # overflowing.
 
     valid = np.isfinite(costs)
+    rr, cc, scaled = _ortools_integer_costs(costs, valid)
 
-    min_e = -8
-    unique = np.unique(costs[valid])
+    assignment = pywrapgraph.LinearSumAssignment()
+    for r, c, v in zip(rr.tolist(), cc.tolist(), scaled.tolist()):
+        assignment.AddArcWithCost(r, c, v)
+    
+    if assignment.Solve() != assignment.OPTIMAL:
+        from scipy.optimize import linear_sum_assignment as scipy_solve
+        return scipy_solve(_prep(costs, valid))
 
-    if unique.shape[0] == 1:
-        min_diff = unique[0]
-    elif unique.shape[0] > 1:
-        min_diff = np.diff(unique).min()
+    n = assignment.NumNodes()
+    if n == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+    right = np.fromiter((assignment.RightMate(i) for i in range(n)), dtype=np.int64, count=n)
+    return np.arange(n, dtype=np.int64), right
+
+def _ortools_integer_costs(costs, valid, min_e=-8):
+    """Returns row and column indices of finite costs and their scaled integer values."""
+    v = costs[valid]
+    v.sort()
+    d = np.diff(v)
+    d = d[d > 0]
+
+    if d.shape[0] > 0:
+        min_diff = d.min()
+    elif v.shape[0] > 0:
+        min_diff = v[0]
     else:
         min_diff = 1
 
@@ -110,35 +177,17 @@ def lsa_solve_ortools(costs):
     e = min(max(min_e, min_diff_e), 0)
     f = 10**abs(e)
 
-    assignment = pywrapgraph.LinearSumAssignment()
-    for r in range(costs.shape[0]):
-        for c in range(costs.shape[1]):
-            if valid[r,c]:
-                assignment.AddArcWithCost(r, c, int(costs[r,c]*f))
-    
-    if assignment.Solve() != assignment.OPTIMAL:
-        return linear_sum_assignment(costs, solver='scipy')
-
-    if assignment.NumNodes() == 0:
-        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
-
-    pairings = []
-    for i in range(assignment.NumNodes()):        
-        pairings.append([i, assignment.RightMate(i)])
-
-    indices = np.array(pairings, dtype=np.int64)
-    return indices[:,0], indices[:,1]
+    # Scale and cast all valid costs at once, so that only native Python ints
+    # cross the wrapper boundary when adding arcs.
+    rr, cc = np.nonzero(valid)
+    scaled = np.rint(costs[rr, cc] * f).astype(np.int64)
+    return rr, cc, scaled
 
 def lsa_solve_lapjv(costs):
+    """Solves the LSA problem using the lap library."""
     from lap import lapjv
 
-    inv = ~np.isfinite(costs)
-    if inv.any():    
-        costs = costs.copy()    
-        valid = costs[~inv]
-        INVDIST = 2 * valid.max() + 1 if valid.shape[0] > 0 else 1.
-        costs[inv] = INVDIST
-
+    costs = _prep(costs)
     r = lapjv(costs, return_cost=False, extend_cost=True)
     indices = np.array((range(costs.shape[0]), r[0]), dtype=np.int64).T        
     indices = indices[indices[:, 1] != -1]
@@ -154,8 +203,8 @@ def init_standard_solvers():
         ('lapsolver', lsa_solve_lapsolver),
         ('lap', lsa_solve_lapjv),        
         ('scipy', lsa_solve_scipy),
-        ('munkres', lsa_solve_munkres),
         ('ortools', lsa_solve_ortools),
+        ('munkres', lsa_solve_munkres),
     ]
 
     solver_map = dict(solvers)    
@@ -163,10 +212,10 @@ def init_standard_solvers():
     available_solvers = [s[0] for s in solvers if importlib.util.find_spec(s[0]) is not None]
     if len(available_solvers) == 0:
         import warnings
-        default_solver = None        
-        warnings.warn('No standard LAP solvers found. Consider `pip install lapsolver` or `pip install scipy`', category=RuntimeWarning)
-    else:
-        default_solver = available_solvers[0]
+        warnings.warn('No standard LAP solvers found. Consider `pip install lapsolver`, `pip install lap` or `pip install scipy`', category=RuntimeWarning)
+
+    # None picks a solver automatically at call time, see `linear_sum_assignment`.
+    default_solver = None
 
 init_standard_solvers()
 
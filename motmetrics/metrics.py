@@ -5,21 +5,54 @@ https://github.com/cheind/py-motmetrics
 """
 
 from __future__ import division
-from collections import OrderedDict, Iterable
-from motmetrics.mot import MOTAccumulator
+from collections import OrderedDict
+from motmetrics.mot import MOTAccumulator, EVENT_TYPES
 from motmetrics.lap import linear_sum_assignment
 import pandas as pd
 import numpy as np
 import inspect
 import itertools
 
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    from inspect import getargspec
+
+_RAW = EVENT_TYPES.index('RAW')
+_MISS = EVENT_TYPES.index('MISS')
+
+def _object_codes(oids):
+    """Returns integer codes and unique values of object ids.
+
+    Integer ids that span a reasonably dense range are offset by their minimum
+    and used as codes directly, which avoids hashing. Other ids are factorized.
+    Missing ids are coded as -1. Not every unique value needs to occur.
+    """
+    values = oids.values
+    if pd.api.types.infer_dtype(values, skipna=True) == 'integer':
+        present = pd.notnull(values)
+        ids = values[present].astype(np.int64)
+        if ids.shape[0] > 0:
+            lo, hi = ids.min(), ids.max()
+            if hi - lo < 2 * ids.shape[0] + 1024:
+                codes = np.full(values.shape[0], -1, dtype=np.int64)
+                codes[present] = ids - lo
+                return codes, np.arange(lo, hi + 1, dtype=np.int64)
+    return pd.factorize(values)
+
+def _type_codes(types):
+    """Returns the integer event type codes of a `Type` column."""
+    if isinstance(types.dtype, pd.api.types.CategoricalDtype) and list(types.cat.categories) == EVENT_TYPES:
+        return types.cat.codes.values
+    return pd.Categorical(types, categories=EVENT_TYPES).codes
+
 class MetricsHost:
     """Keeps track of metrics and intra metric dependencies."""
 
     def __init__(self):
         self.metrics = OrderedDict()
 
-    def register(self, fnc, deps='auto', name=None, helpstr=None, formatter=None):
+    def register(self, fnc, deps='auto', name=None, helpstr=None, formatter=None, hidden=False):
         """Register a new metric.
 
         Params
@@ -47,14 +80,18 @@ class MetricsHost:
         formatter: Format object, optional
             An optional default formatter when rendering metric results as string. I.e to
             render the result `0.35` as `35%` one would pass `{:.2%}.format`
+        hidden : bool, optional
+            If true the metric only serves as dependency of other metrics. It is
+            not listed in `names` or `list_metrics` and not part of computed results
+            unless explicitly requested.
         """        
 
         assert not fnc is None, 'No function given for metric {}'.format(name)
 
         if deps is None:
             deps = []
-        elif deps is 'auto':            
-            deps = inspect.getargspec(fnc).args[1:] # assumes dataframe as first argument
+        elif deps == 'auto':            
+            deps = getargspec(fnc).args[1:] # assumes dataframe as first argument
 
         if name is None:
             name = fnc.__name__ # Relies on meaningful function names, i.e don't use for lambdas
@@ -68,13 +105,14 @@ class MetricsHost:
             'fnc' : fnc,
             'deps' : deps,
             'help' : helpstr,
-            'formatter' : formatter
+            'formatter' : formatter,
+            'hidden' : hidden
         }
 
     @property
     def names(self):
         """Returns the name identifiers of all registered metrics."""
-        return [v['name'] for v in self.metrics.values()]
+        return [v['name'] for v in self.metrics.values() if not v['hidden']]
     
     @property
     def formatters(self):
@@ -84,10 +122,11 @@ class MetricsHost:
     def list_metrics(self, include_deps=False):
         """Returns a dataframe containing names, descriptions and optionally dependencies for each metric."""
         cols = ['Name', 'Description', 'Dependencies']
+        visible = [m for m in self.metrics.values() if not m['hidden']]
         if include_deps:
-            data = [(m['name'], m['help'], m['deps']) for m in self.metrics.values()]
+            data = [(m['name'], m['help'], m['deps']) for m in visible]
         else:
-            data = [(m['name'], m['help']) for m in self.metrics.values()]
+            data = [(m['name'], m['help']) for m in visible]
             cols = cols[:-1]
 
         return pd.DataFrame(data, columns=cols)
@@ -134,18 +173,20 @@ class MetricsHost:
         class DfMap : pass
         df_map = DfMap()
         df_map.full = df     
-        df_map.raw = df[df.Type == 'RAW']
-        df_map.noraw = df[df.Type != 'RAW']
+        israw = _type_codes(df.Type) == _RAW
+        df_map.raw = df[israw]
+        df_map.noraw = df[~israw]
 
         cache = {}
         for mname in metrics:
-            cache[mname] = self._compute(df_map, mname, cache, parent='summarize')            
+            if mname not in cache:
+                cache[mname] = self._compute(df_map, mname, cache, parent='summarize')            
 
         if name is None:
             name = 0 
 
         if return_cached:
-            data = cache
+            data = OrderedDict([(k, v) for k, v in cache.items() if k in metrics or not self.metrics[k]['hidden']])
         else:
             data = OrderedDict([(k, cache[k]) for k in metrics])
             
@@ -188,8 +229,17 @@ class MetricsHost:
             dfs += [MOTAccumulator.merge_event_dataframes(dfs)]
             names += ['OVERALL']
 
-        partials = [self.compute(acc, metrics=metrics, name=name) for acc, name in zip(dfs, names)]
-        return pd.concat(partials)
+        partials = [self.compute(acc, metrics=metrics, return_dataframe=False) for acc in dfs]
+
+        if all(np.isscalar(v) for p in partials for v in p.values()):
+            # Build a single dataframe at the end instead of constructing and
+            # concatenating one single-row dataframe per container.
+            columns = list(partials[0].keys()) if len(partials) > 0 else None
+            return pd.DataFrame(partials, index=names, columns=columns)
+        
+        # Non-scalar metrics (i.e. frequencies) are treated by the same row
+        # constructor as used by `compute`.
+        return pd.concat([pd.DataFrame(p, index=[name]) for p, name in zip(partials, names)])
 
     def _compute(self, df_map, name, cache, parent=None):
         """Compute metric and resolve dependencies."""
@@ -198,43 +248,61 @@ class MetricsHost:
         minfo = self.metrics[name]
         vals = []
         for depname in minfo['deps']:
-            v = cache.get(depname, None)
-            if v is None:
-                v = cache[depname] = self._compute(df_map, depname, cache, parent=name)
-            vals.append(v)
+            if depname not in cache:
+                cache[depname] = self._compute(df_map, depname, cache, parent=name)
+            vals.append(cache[depname])
         return minfo['fnc'](df_map, *vals)
 
 def num_frames(df):
     """Total number of frames."""
-    return df.full.index.get_level_values(0).unique().shape[0]
+    # Unique frame ids are the used entries of the first index level. Avoids
+    # materializing and hashing the frame id of every single event.
+    return len(df.full.index.remove_unused_levels().levels[0])
+
+def obj_codes(df):
+    """Integer object id codes per event and the unique object ids they refer to."""
+    codes, uniques = _object_codes(df.noraw.OId)
+    return {
+        'codes' : codes,
+        'uniques' : uniques
+    }
 
-def obj_frequencies(df):
+def obj_frequencies(df, obj_codes):
     """Total number of occurrences of individual objects over all frames."""
-    return df.noraw.OId.value_counts()
+    codes, uniques = obj_codes['codes'], obj_codes['uniques']
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    present = counts > 0
+    return pd.Series(counts[present], index=pd.Index(uniques[present], name='OId'), name='OId')
 
 def pred_frequencies(df):
     """Total number of occurrences of individual predictions over all frames."""
-    return df.noraw.HId.value_counts()
+    return df.noraw.HId.value_counts(sort=False)
 
 def num_unique_objects(df, obj_frequencies):
     """Total number of unique object ids encountered."""
     return len(obj_frequencies)
 
-def num_matches(df):
+def type_counts(df):
+    """Total number of events per event type."""
+    codes = _type_codes(df.noraw.Type)
+    counts = np.bincount(codes[codes >= 0], minlength=len(EVENT_TYPES))
+    return pd.Series(counts, index=EVENT_TYPES)
+
+def num_matches(df, type_counts):
     """Total number matches."""
-    return df.noraw.Type.isin(['MATCH']).sum()
+    return type_counts['MATCH']
 
-def num_switches(df):
+def num_switches(df, type_counts):
     """Total number of track switches."""
-    return df.noraw.Type.isin(['SWITCH']).sum()
+    return type_counts['SWITCH']
 
-def num_false_positives(df):
+def num_false_positives(df, type_counts):
     """Total number of false positives (false-alarms)."""
-    return df.noraw.Type.isin(['FP']).sum()
+    return type_counts['FP']
 
-def num_misses(df):
+def num_misses(df, type_counts):
     """Total number of misses."""
-    return df.noraw.Type.isin(['MISS']).sum()
+    return type_counts['MISS']
 
 def num_detections(df, num_matches, num_switches):
     """Total number of detected objects including matches and switches."""
@@ -244,18 +312,18 @@ def num_objects(df, obj_frequencies):
     """Total number of unique object appearances over all frames."""
     return obj_frequencies.sum()
 
-def num_predictions(df, pred_frequencies):
-    """Total number of unique prediction appearances over all frames."""
-    return pred_frequencies.sum()
-
 def num_predictions(df):
     """Total number of unique prediction appearances over all frames."""
     return df.noraw.HId.count()
 
-def track_ratios(df, obj_frequencies):
+def track_ratios(df, obj_frequencies, obj_codes):
     """Ratio of assigned to total appearance count per unique object id."""   
-    tracked = df.noraw[df.noraw.Type != 'MISS']['OId'].value_counts()
-    return tracked.div(obj_frequencies).fillna(0.)
+    codes, uniques = obj_codes['codes'], obj_codes['uniques']
+    valid = codes >= 0
+    notmiss = (_type_codes(df.noraw.Type) != _MISS)[valid]
+    tracked = np.bincount(codes[valid], weights=notmiss.astype(np.float64), minlength=len(uniques))
+    tracked = pd.Series(tracked, index=pd.Index(uniques, name='OId'))
+    return tracked.reindex(obj_frequencies.index).div(obj_frequencies).fillna(0.)
 
 def mostly_tracked(df, track_ratios):
     """Number of objects tracked for at least 80 percent of lifespan."""
@@ -269,21 +337,32 @@ def mostly_lost(df, track_ratios):
     """Number of objects tracked less than 20 percent of lifespan."""
     return track_ratios[track_ratios < 0.2].count()
 
-def num_fragmentations(df, obj_frequencies):
+def num_fragmentations(df, obj_codes):
     """Total number of switches from tracked to not tracked."""
-    fra = 0
-    for o in obj_frequencies.index:
-        # Find first and last time object was not missed (track span). Then count
-        # the number switches from NOT MISS to MISS state.
-        dfo = df.noraw[df.noraw.OId == o]
-        notmiss = dfo[dfo.Type != 'MISS']
-        if len(notmiss) == 0:
-            continue
-        first = notmiss.index[0]
-        last = notmiss.index[-1]
-        diffs = dfo.loc[first:last].Type.apply(lambda x: 1 if x == 'MISS' else 0).diff()
-        fra += diffs[diffs == 1].count()
-    return fra
+    codes = obj_codes['codes']
+    is_miss = _type_codes(df.noraw.Type) == _MISS
+
+    # Bring events of each object together while keeping their temporal order.
+    keep = codes >= 0
+    order = np.argsort(codes[keep], kind='mergesort')
+    codes = codes[keep][order]
+    miss = is_miss[keep][order].astype(np.int8)
+    if codes.shape[0] == 0:
+        return 0
+
+    # Every switch from tracked to not tracked that is followed by another
+    # tracked event shows up as exactly one MISS -> tracked transition, as
+    # long as the object has been tracked before.
+    same = codes[1:] == codes[:-1]
+    back = (np.diff(miss) == -1) & same
+
+    tracked = 1 - miss.astype(np.int64)
+    cs = np.cumsum(tracked)
+    starts = np.flatnonzero(np.r_[True, ~same])
+    offsets = np.repeat(cs[starts] - tracked[starts], np.diff(np.r_[starts, codes.shape[0]]))
+    started = (cs - offsets) > 0
+
+    return int((back & started[:-1]).sum())
 
 def motp(df, num_detections):
     """Multiple object tracker precision."""
@@ -306,18 +385,17 @@ def id_global_assignment(df):
 
     oids = df.full['OId'].dropna().unique()
     hids = df.full['HId'].dropna().unique()
-    hids_idx = dict((h,i) for i,h in enumerate(hids))
 
-    hcs = [len(df.raw[(df.raw.HId==h)].groupby(level=0)) for h in hids]
-    ocs = [len(df.raw[(df.raw.OId==o)].groupby(level=0)) for o in oids]
+    # Number of frames each object / hypothesis is present in. Grouped once
+    # instead of filtering the raw events per id.
+    raw = df.raw
+    fids = pd.Series(raw.index.get_level_values(0))
+    hcs = fids.groupby(raw.HId.values, sort=False).nunique().reindex(hids, fill_value=0).values
+    ocs = fids.groupby(raw.OId.values, sort=False).nunique().reindex(oids, fill_value=0).values
 
     no = oids.shape[0]
     nh = hids.shape[0]   
 
-    df = df.raw.reset_index()    
-    df = df.set_index(['OId','HId']) 
-    df = df.sort_index(level=[0,1])
-
     fpmatrix = np.full((no+nh, no+nh), 0.)
     fnmatrix = np.full((no+nh, no+nh), 0.)
     fpmatrix[no:, :nh] = np.nan
@@ -331,13 +409,13 @@ def id_global_assignment(df):
         fpmatrix[:no, c] = hc
         fpmatrix[c+no,c] = hc
 
-    for r, o in enumerate(oids):
-        df_o = df.loc[o, 'D'].dropna()
-        for h, ex in df_o.groupby(level=0).count().iteritems():            
-            c = hids_idx[h]
-
-            fpmatrix[r,c] -= ex
-            fnmatrix[r,c] -= ex
+    # Number of frames each object / hypothesis pair could have been matched in.
+    ex = raw.dropna(subset=['D']).groupby(['OId', 'HId'], sort=False).size()
+    rs = pd.Index(oids, dtype=object).get_indexer(ex.index.get_level_values(0))
+    cs = pd.Index(hids, dtype=object).get_indexer(ex.index.get_level_values(1))
+    assert (rs >= 0).all() and (cs >= 0).all(), 'Unknown object or hypothesis id in raw events.'
+    fpmatrix[rs, cs] -= ex.values
+    fnmatrix[rs, cs] -= ex.values
 
     costs = fpmatrix + fnmatrix    
     rids, cids = linear_sum_assignment(costs)
@@ -382,8 +460,10 @@ def create():
     m = MetricsHost()
 
     m.register(num_frames, formatter='{:d}'.format)
+    m.register(obj_codes, hidden=True)
     m.register(obj_frequencies, formatter='{:d}'.format)    
     m.register(pred_frequencies, formatter='{:d}'.format)
+    m.register(type_counts, hidden=True)
     m.register(num_matches, formatter='{:d}'.format)
     m.register(num_switches, formatter='{:d}'.format)
     m.register(num_false_positives, formatter='{:d}'.format)
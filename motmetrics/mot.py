@@ -11,6 +11,13 @@ from collections import OrderedDict
 from itertools import count
 from motmetrics.lap import linear_sum_assignment
 
+_INDEX_FIELDS = ['FrameId', 'Event']
+_EVENT_FIELDS = ['Type', 'OId', 'HId', 'D']
+
+EVENT_TYPES = ['RAW', 'FP', 'MISS', 'SWITCH', 'MATCH']
+"""Event types in the order of the integer codes backing the categorical `Type` column."""
+_EVENT_TYPE_CODES = dict((t, i) for i, t in enumerate(EVENT_TYPES))
+
 class MOTAccumulator(object):
     """Manage tracking events.
     
@@ -84,14 +91,24 @@ class MOTAccumulator(object):
     def reset(self):
         """Reset the accumulator to empty state."""
 
-        self._events = []
-        self._indices = []
+        self._events = {field: [] for field in _EVENT_FIELDS}
+        self._indices = {field: [] for field in _INDEX_FIELDS}
         #self.events = MOTAccumulator.new_event_dataframe()
         self.m = {} # Pairings up to current timestamp  
         self.last_occurrence = {} # Tracks most recent occurance of object
         self.dirty_events = True
         self.cached_events_df = None
 
+    def _append_to_indices(self, frameid, eid):
+        self._indices['FrameId'].append(frameid)
+        self._indices['Event'].append(eid)
+
+    def _append_to_events(self, typestr, oid, hid, distance):
+        self._events['Type'].append(_EVENT_TYPE_CODES[typestr])
+        self._events['OId'].append(oid)
+        self._events['HId'].append(hid)
+        self._events['D'].append(distance)
+
     def update(self, oids, hids, dists, frameid=None):
         """Updates the accumulator with frame specific objects/detections.
 
@@ -139,8 +156,8 @@ class MOTAccumulator(object):
 
         if frameid is None:            
             assert self.auto_id, 'auto-id is not enabled'
-            if len(self._indices) > 0:
-                frameid = self._indices[-1][0] + 1
+            if len(self._indices['FrameId']) > 0:
+                frameid = self._indices['FrameId'][-1] + 1
             else:
                 frameid = 0
         else:
@@ -156,16 +173,16 @@ class MOTAccumulator(object):
         if no * nh > 0:
             for i in range(no):
                 for j in range(nh):
-                    self._indices.append((frameid, next(eid)))
-                    self._events.append(['RAW', oids[i], hids[j], dists[i,j]])
+                    self._append_to_indices(frameid, next(eid))
+                    self._append_to_events('RAW', oids[i], hids[j], dists[i,j])
         elif no == 0:
             for i in range(nh):
-                self._indices.append((frameid, next(eid)))
-                self._events.append(['RAW', np.nan, hids[i], np.nan])       
+                self._append_to_indices(frameid, next(eid))
+                self._append_to_events('RAW', np.nan, hids[i], np.nan)       
         elif nh == 0:
             for i in range(no):
-                self._indices.append((frameid, next(eid)))
-                self._events.append(['RAW', oids[i], np.nan, np.nan])
+                self._append_to_indices(frameid, next(eid))
+                self._append_to_events('RAW', oids[i], np.nan, np.nan)
 
         if oids.size * hids.size > 0:    
             # 1. Try to re-establish tracks from previous correspondences
@@ -184,8 +201,8 @@ class MOTAccumulator(object):
                     hids[j] = ma.masked
                     self.m[oids.data[i]] = hids.data[j]
                     
-                    self._indices.append((frameid, next(eid)))
-                    self._events.append(['MATCH', oids.data[i], hids.data[j], dists[i, j]])
+                    self._append_to_indices(frameid, next(eid))
+                    self._append_to_events('MATCH', oids.data[i], hids.data[j], dists[i, j])
 
             # 2. Try to remaining objects/hypotheses
             dists[oids.mask, :] = np.nan
@@ -203,21 +220,21 @@ class MOTAccumulator(object):
                             self.m[o] != h and \
                             abs(frameid - self.last_occurrence[o]) <= self.max_switch_time
                 cat = 'SWITCH' if is_switch else 'MATCH'
-                self._indices.append((frameid, next(eid)))
-                self._events.append([cat, oids.data[i], hids.data[j], dists[i, j]])
+                self._append_to_indices(frameid, next(eid))
+                self._append_to_events(cat, oids.data[i], hids.data[j], dists[i, j])
                 oids[i] = ma.masked
                 hids[j] = ma.masked
                 self.m[o] = h
 
         # 3. All remaining objects are missed
         for o in oids[~oids.mask]:
-            self._indices.append((frameid, next(eid)))
-            self._events.append(['MISS', o, np.nan, np.nan])
+            self._append_to_indices(frameid, next(eid))
+            self._append_to_events('MISS', o, np.nan, np.nan)
         
         # 4. All remaining hypotheses are false alarms
         for h in hids[~hids.mask]:
-            self._indices.append((frameid, next(eid)))
-            self._events.append(['FP', np.nan, h, np.nan])
+            self._append_to_indices(frameid, next(eid))
+            self._append_to_events('FP', np.nan, h, np.nan)
 
         # 5. Update occurance state
         for o in oids.data:            
@@ -228,7 +245,7 @@ class MOTAccumulator(object):
     @property
     def events(self):
         if self.dirty_events:
-            self.cached_events_df = MOTAccumulator.new_event_dataframe_with_data(self._indices, self._events)
+            self.cached_events_df = MOTAccumulator._new_event_dataframe_from_columns(self._indices, self._events)
             self.dirty_events = False
         return self.cached_events_df
     
@@ -241,7 +258,7 @@ class MOTAccumulator(object):
     def new_event_dataframe():
         """Create a new DataFrame for event tracking."""
         idx = pd.MultiIndex(levels=[[],[]], labels=[[],[]], names=['FrameId','Event'])
-        cats = pd.Categorical([], categories=['RAW', 'FP', 'MISS', 'SWITCH', 'MATCH'])
+        cats = pd.Categorical([], categories=EVENT_TYPES)
         df = pd.DataFrame(
             OrderedDict([
                 ('Type', pd.Series(cats)),          # Type of event. One of FP (false positive), MISS, SWITCH, MATCH
@@ -266,17 +283,38 @@ class MOTAccumulator(object):
             'Type', 'OId', HId', 'D'                    
         """
 
+        if len(events) == 0:
+            return MOTAccumulator.new_event_dataframe()
+
         tevents = list(zip(*events))
+        tindices = list(zip(*indices))
+
+        columns = dict(zip(_EVENT_FIELDS, tevents))
+        columns['Type'] = pd.Categorical(tevents[0], categories=EVENT_TYPES).codes
+        return MOTAccumulator._new_event_dataframe_from_columns(dict(zip(_INDEX_FIELDS, tindices)), columns)
+
+    @staticmethod
+    def _new_event_dataframe_from_columns(indices, events):
+        """Create a new DataFrame from column-wise event data.
+        
+        Params
+        ------
+        indices: dict
+            dict of lists with fields 'FrameId', 'Event'
+        events: dict
+            dict of lists with fields 'Type', 'OId', 'HId', 'D'. Types are
+            given as integer codes into `EVENT_TYPES`.
+        """
 
-        raw_type = pd.Categorical(tevents[0], categories=['RAW', 'FP', 'MISS', 'SWITCH', 'MATCH'], ordered=False)
+        raw_type = pd.Categorical.from_codes(np.asarray(events['Type'], dtype=np.int8), categories=EVENT_TYPES, ordered=False)
         series = [
             pd.Series(raw_type, name='Type'),
-            pd.Series(tevents[1], dtype=object, name='OId'),
-            pd.Series(tevents[2], dtype=object, name='HId'),
-            pd.Series(tevents[3], dtype=float, name='D')
+            pd.Series(events['OId'], dtype=object, name='OId'),
+            pd.Series(events['HId'], dtype=object, name='HId'),
+            pd.Series(events['D'], dtype=float, name='D')
         ]
         
-        idx = pd.MultiIndex.from_tuples(indices, names=['FrameId','Event'])
+        idx = pd.MultiIndex.from_arrays([indices[field] for field in _INDEX_FIELDS], names=_INDEX_FIELDS)
         df = pd.concat(series, axis=1)
         df.index = idx
         return df
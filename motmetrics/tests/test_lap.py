@@ -22,6 +22,37 @@ def test_lap_solvers():
     [np.testing.assert_allclose(r, expected) for r in results]
     np.testing.assert_allclose(costs, costs_copy)
 
+def test_lap_tiny():
+    rng = np.random.RandomState(0)
+    for shape in [(1, 1), (1, 4), (4, 1), (2, 3), (3, 2), (4, 4)]:
+        costs = rng.rand(*shape)
+        costs[rng.rand(*shape) < 0.3] = np.nan
+        rids, cids = lap.lsa_solve_tiny(costs)
+        erids, ecids = lap.linear_sum_assignment(costs, solver='scipy')
+        np.testing.assert_allclose(rids, erids)
+        np.testing.assert_allclose(cids, ecids)
+
+    rids, cids = lap.lsa_solve_tiny(np.empty((0, 3)))
+    assert rids.shape[0] == 0 and cids.shape[0] == 0
+
+def test_ortools_integer_costs():
+    for c in [np.empty((0, 0)), np.empty((0, 3)), np.full((2, 2), np.nan)]:
+        rr, cc, scaled = lap._ortools_integer_costs(c, np.isfinite(c))
+        assert rr.shape[0] == 0 and cc.shape[0] == 0 and scaled.shape[0] == 0
+
+    # Scaled such that the minimum difference is representable in the first digit
+    c = np.array([[0.0625, np.nan], [0.125, 3.]])
+    rr, cc, scaled = lap._ortools_integer_costs(c, np.isfinite(c))
+    np.testing.assert_array_equal(rr, [0, 1, 1])
+    np.testing.assert_array_equal(cc, [0, 0, 1])
+    np.testing.assert_array_equal(scaled, [6, 12, 300])
+    assert scaled.dtype == np.int64
+
+    # Scale factor is limited to 1e8
+    c = np.array([[1e-10, 2e-10], [np.inf, 5.]])
+    rr, cc, scaled = lap._ortools_integer_costs(c, np.isfinite(c))
+    np.testing.assert_array_equal(scaled, [0, 0, 500000000])
+
 def test_change_solver():
     
     def mysolver(x):
@@ -37,3 +68,39 @@ def test_change_solver():
     rids, cids = lap.linear_sum_assignment(costs)
     assert mysolver.called == 1
 
+def test_change_solver_tiny(monkeypatch):
+    calls = []
+
+    def wrap(name):
+        solver = lap.solver_map[name]
+        def wrapped(x):
+            calls.append(name)
+            return solver(x)
+        monkeypatch.setitem(lap.solver_map, name, wrapped)
+
+    for name in lap.available_solvers:
+        wrap(name)
+
+    costs = np.array([[6, 9],[10, 3.]])
+
+    # Tiny problems are short-circuited when the solver is picked automatically
+    assert lap.default_solver is None
+    rids, cids = lap.linear_sum_assignment(costs)
+    assert calls == []
+
+    # A solver chosen by name is always honoured, even the automatically picked one
+    for name in lap.available_solvers:
+        with lap.set_default_solver(name):
+            rids, cids = lap.linear_sum_assignment(costs)
+        np.testing.assert_allclose(cids, [0, 1])
+    assert calls == lap.available_solvers
+
+    rids, cids = lap.linear_sum_assignment(costs)
+    assert calls == lap.available_solvers
+
+    # Also when assigned directly, as done by the apps
+    del calls[:]
+    for name in lap.available_solvers:
+        monkeypatch.setattr(lap, 'default_solver', name)
+        rids, cids = lap.linear_sum_assignment(costs)
+    assert calls == lap.available_solvers
@@ -63,6 +63,59 @@ def test_metricscontainer_autoname():
     assert summary.iloc[0]['mul'] == -3.
     assert summary.iloc[0]['add'] == 3.
 
+def test_metricscontainer_compute_once():
+    calls = {'a': 0, 'add': 0}
+
+    def a(df):
+        calls['a'] += 1
+        return 1.
+
+    def add(df, a):
+        calls['add'] += 1
+        return a + 1.
+
+    def mul(df, a, add):
+        return a * add
+
+    m = mm.metrics.MetricsHost()
+    m.register(a, deps='auto')
+    m.register(add, deps='auto')
+    m.register(mul, deps='auto')
+    summary = m.compute(mm.MOTAccumulator.new_event_dataframe(), metrics=['mul', 'add', 'a'])
+    assert summary.columns.values.tolist() == ['mul', 'add', 'a']
+    assert summary.iloc[0]['mul'] == 2.
+    assert calls == {'a': 1, 'add': 1}
+
+def test_metricscontainer_hidden():
+    m = mm.metrics.MetricsHost()
+    m.register(lambda df: 2., name='a', hidden=True)
+    m.register(lambda df, a: a + 1., deps=['a'], name='add')
+
+    assert m.names == ['add']
+    assert m.list_metrics().Name.tolist() == ['add']
+
+    df = mm.MOTAccumulator.new_event_dataframe()
+    summary = m.compute(df)
+    assert summary.columns.values.tolist() == ['add']
+    assert summary.iloc[0]['add'] == 3.
+    assert list(m.compute(df, return_dataframe=False, return_cached=True).keys()) == ['add']
+    assert m.compute(df, metrics=['a']).iloc[0]['a'] == 2.
+
+    mh = mm.metrics.create()
+    assert 'type_counts' not in mh.names
+    assert 'obj_codes' not in mh.names
+
+def test_compute_many_consistent():
+    acc = mm.MOTAccumulator()
+    acc.update([1, 2], ['a', 'b'], [[1, 0.5], [0.3, 1]], frameid=0)
+    acc.update([1, 2], ['a'], [[0.2], [np.nan]], frameid=1)
+
+    mh = mm.metrics.create()
+    for metrics in [None, mm.metrics.motchallenge_metrics]:
+        summary = mh.compute_many([acc, acc], metrics=metrics, names=['x', 'y'])
+        expected = pd.concat([mh.compute(acc, metrics=metrics, name=n) for n in ['x', 'y']])
+        pd.testing.assert_frame_equal(summary, expected)
+
 def test_mota_motp():
     acc = mm.MOTAccumulator()
 
@@ -91,8 +144,49 @@ def test_mota_motp():
     assert metr['num_predictions'] == 8
     assert metr['mota'] == approx(1. - (2 + 2 + 2) / 8)
     assert metr['motp'] == approx(11.1 / 6)
+
+    # Frames without events are not counted
+    assert mh.compute(acc, metrics='num_frames', return_dataframe=False)['num_frames'] == 5
     
 
+def test_track_ratios():
+    acc = mm.MOTAccumulator(auto_id=True)
+
+    # Object 1 tracked in all frames, object 2 in two out of five, object 3 never
+    for i in range(5):
+        d2 = 0.5 if i < 2 else np.nan
+        acc.update([1, 2, 3], ['a', 'b'], [[0.1, np.nan], [np.nan, d2], [np.nan, np.nan]])
+
+    mh = mm.metrics.create()
+    metr = mh.compute(acc, metrics=['mostly_tracked', 'partially_tracked', 'mostly_lost', 'num_misses'], return_dataframe=False, return_cached=True)
+
+    assert metr['track_ratios'][1] == approx(1.)
+    assert metr['track_ratios'][2] == approx(0.4)
+    assert metr['track_ratios'][3] == approx(0.)
+    assert metr['mostly_tracked'] == 1
+    assert metr['partially_tracked'] == 1
+    assert metr['mostly_lost'] == 1
+    assert metr['num_misses'] == 8
+
+def test_fragmentations():
+    # Per frame tracked (T) / missed (M) state of objects 1 and 2, object 3 is always missed.
+    # Object 1: M T M T M M -> leading and trailing misses do not count, 1 fragmentation
+    # Object 2: T M M T M T -> 2 fragmentations
+    states = ['MT', 'TM', 'MM', 'TT', 'MM', 'MT']
+
+    acc = mm.MOTAccumulator(auto_id=True)
+    for s in states:
+        d1 = 0.1 if s[0] == 'T' else np.nan
+        d2 = 0.1 if s[1] == 'T' else np.nan
+        acc.update([1, 2, 3], ['a', 'b'], [[d1, np.nan], [np.nan, d2], [np.nan, np.nan]])
+
+    mh = mm.metrics.create()
+    metr = mh.compute(acc, metrics=['num_fragmentations'], return_dataframe=False)
+    assert metr['num_fragmentations'] == 3
+
+    metr = mh.compute(mm.MOTAccumulator.new_event_dataframe(), metrics=['num_fragmentations'], return_dataframe=False)
+    assert metr['num_fragmentations'] == 0
+
 def test_correct_average():
     # Tests what is being depicted in figure 3 of 'Evaluating MOT Performance'
     acc = mm.MOTAccumulator(auto_id=True)
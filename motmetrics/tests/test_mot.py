@@ -58,6 +58,26 @@ def test_events():
     assert_frame_equal(acc.events, expect)
     
 
+def test_new_event_dataframe_with_data():
+    indices = [(0, 0), (0, 1), (1, 0)]
+    events = [
+        ['RAW', 1, 'a', 0.5],
+        ['MATCH', 1, 'a', 0.5],
+        ['MISS', 1, np.nan, np.nan],
+    ]
+    df = mm.MOTAccumulator.new_event_dataframe_with_data(indices, events)
+
+    assert df.index.names == ['FrameId', 'Event']
+    assert df.index.tolist() == indices
+    assert df.Type.tolist() == ['RAW', 'MATCH', 'MISS']
+    assert df.Type.cat.categories.tolist() == ['RAW', 'FP', 'MISS', 'SWITCH', 'MATCH']
+    assert df.OId.tolist() == [1, 1, 1]
+    assert df.HId.tolist()[:2] == ['a', 'a']
+    np.testing.assert_allclose(df.D.values, [0.5, 0.5, np.nan])
+
+    df = mm.MOTAccumulator.new_event_dataframe_with_data([], [])
+    assert len(df) == 0
+
 def test_max_switch_time():
     acc = mm.MOTAccumulator(max_switch_time=1)
     acc.update([1, 2], ['a', 'b'], [[1, 0.5], [0.3, 1]], frameid=1) # 1->a, 2->b